@@ -4,7 +4,8 @@
  * Lambda Build Script
  *
  * Builds all Lambda function packages by creating zip files
- * from the source code in terraform/photography-app/lambda/
+ * from the source code in terraform/photography-app/lambda/,
+ * and Lambda layers from terraform/photography-app/layers/
  *
  * Output: .zip files in terraform/photography-app/
  */
@@ -14,6 +15,7 @@ const fs = require('fs');
 const path = require('path');
 
 const LAMBDA_DIR = path.join(__dirname, '..', 'terraform', 'photography-app', 'lambda');
+const LAYERS_DIR = path.join(__dirname, '..', 'terraform', 'photography-app', 'layers');
 const OUTPUT_DIR = path.join(__dirname, '..', 'terraform', 'photography-app');
 
 // Get all Lambda function directories
@@ -64,8 +66,9 @@ for (const func of lambdaFunctions) {
       // Copy index.py to temp
       fs.copyFileSync(indexPath, path.join(tempDir, 'index.py'));
 
-      // Install dependencies
-      execSync(`pip install -r requirements.txt -t .build --quiet`, {
+      // Install dependencies as pre-built wheels for the Lambda runtime
+      // (Python 3.12 on arm64/Graviton2, see architectures in main.tf)
+      execSync(`pip install -r requirements.txt -t .build --platform manylinux2014_aarch64 --only-binary=:all: --python-version 3.12 --implementation cp --quiet`, {
         cwd: funcPath,
         stdio: 'pipe'
       });
@@ -98,6 +101,62 @@ for (const func of lambdaFunctions) {
   }
 }
 
+// Build Lambda layers (shared dependencies such as Pillow)
+// Layer contents go under python/, which Lambda adds to sys.path from /opt/python
+const lambdaLayers = fs.existsSync(LAYERS_DIR)
+  ? fs.readdirSync(LAYERS_DIR).filter(item => fs.statSync(path.join(LAYERS_DIR, item)).isDirectory())
+  : [];
+
+for (const layer of lambdaLayers) {
+  const layerPath = path.join(LAYERS_DIR, layer);
+  const zipPath = path.join(OUTPUT_DIR, `${layer}_layer.zip`);
+
+  if (!fs.existsSync(path.join(layerPath, 'requirements.txt'))) {
+    console.log(`  Skipping ${layer} layer (no requirements.txt found)`);
+    continue;
+  }
+
+  try {
+    console.log(`  Building ${layer} layer...`);
+
+    if (fs.existsSync(zipPath)) {
+      fs.unlinkSync(zipPath);
+    }
+
+    const tempDir = path.join(layerPath, '.build');
+    if (fs.existsSync(tempDir)) {
+      fs.rmSync(tempDir, { recursive: true });
+    }
+    fs.mkdirSync(tempDir);
+
+    // Install dependencies as pre-built wheels for the Lambda runtime
+    // (Python 3.12 on arm64/Graviton2, see architectures in main.tf)
+    execSync(`pip install -r requirements.txt -t .build/python --platform manylinux2014_aarch64 --only-binary=:all: --python-version 3.12 --implementation cp --no-compile --quiet`, {
+      cwd: layerPath,
+      stdio: 'pipe'
+    });
+
+    // Fixed timestamps keep the zip (and its source_code_hash) identical
+    // between builds, so Terraform only publishes a new layer version when
+    // the requirements change
+    execSync(`find python -exec touch -h -t 198001010000 {} + && find python | sort | zip -X -q "${zipPath}" -@`, {
+      cwd: tempDir,
+      stdio: 'pipe'
+    });
+
+    fs.rmSync(tempDir, { recursive: true });
+
+    const stats = fs.statSync(zipPath);
+    const sizeKB = (stats.size / 1024).toFixed(1);
+    console.log(`    -> ${layer}_layer.zip (${sizeKB} KB)`);
+    successCount++;
+
+  } catch (error) {
+    console.error(`  ERROR building ${layer} layer: ${error.message}`);
+    failCount++;
+  }
+}
+
 console.log(`\nBuild complete: ${successCount} succeeded, ${failCount} failed`);
 
 if (failCount > 0) {
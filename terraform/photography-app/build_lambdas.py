@@ -2,12 +2,122 @@
 """Build Lambda deployment packages"""
 
 import os
+import hashlib
+import stat
 import zipfile
 import subprocess
 import shutil
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Target platform for pre-built wheels compatible with AWS Lambda (Amazon Linux 2)
+# Functions run on arm64 (Graviton2), see architectures in main.tf
+PIP_PLATFORM = "manylinux2014_aarch64"
+PYTHON_VERSION = "3.12"
+
+# Installed dependency trees, keyed by requirements.txt contents + target platform
+DEPENDENCY_CACHE_DIR = Path.home() / ".cache" / "photography-lambda"
+
+# Fixed entry timestamp so identical inputs produce byte-identical zips
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Builds run in parallel threads; serialize output so lines don't interleave
+print_lock = threading.Lock()
+
+def log(message):
+    """Print a line of build output from any worker thread"""
+    with print_lock:
+        print(message)
+
+def install_dependencies(requirements_txt, function_name):
+    """
+    Install requirements into the dependency cache and return the directory.
+
+    The cache key covers the exact requirements and target platform, so an
+    existing directory can be reused as-is. Installs go to a staging directory
+    that is renamed into place only once pip succeeds.
+    """
+    cache_key = hashlib.sha256(
+        requirements_txt.read_bytes() + f"|{PIP_PLATFORM}|cp{PYTHON_VERSION}".encode()
+    ).hexdigest()
+    deps_dir = DEPENDENCY_CACHE_DIR / cache_key
+
+    if deps_dir.exists():
+        log(f"  Using cached dependencies for {function_name}")
+        return deps_dir
+
+    log(f"  Installing dependencies for {function_name}...")
+    DEPENDENCY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(dir=DEPENDENCY_CACHE_DIR, prefix=f"{cache_key}."))
+
+    try:
+        subprocess.run(
+            [
+                "pip", "install",
+                "-r", str(requirements_txt),
+                "-t", str(staging_dir),
+                "--platform", PIP_PLATFORM,
+                "--only-binary=:all:",
+                "--python-version", PYTHON_VERSION,
+                "--implementation", "cp",
+                "--quiet"
+            ],
+            check=True
+        )
+        os.rename(staging_dir, deps_dir)
+    except OSError:
+        # Another build populated the same cache entry first
+        if not deps_dir.exists():
+            raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return deps_dir
+
+def iter_package_files(root, prefix=''):
+    """
+    Yield (path, arcname) for every file under root in a single scandir pass.
+
+    Bytecode is skipped: pip compiles it for the build machine's Python, not
+    the Lambda runtime, so it only adds size.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name != '__pycache__':
+                    yield from iter_package_files(entry.path, f"{prefix}{entry.name}/")
+            elif not entry.name.endswith('.pyc'):
+                yield entry.path, f"{prefix}{entry.name}"
+
+def add_file(zipf, path, arcname):
+    """Write a file into the zip with a fixed timestamp and permissions"""
+    zip_info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+    zip_info.external_attr = (stat.S_IFREG | 0o644) << 16
+    with open(path, 'rb') as f:
+        zipf.writestr(zip_info, f.read(), compress_type=zipf.compression, compresslevel=zipf.compresslevel)
+
+def input_digest(inputs):
+    """
+    Hash the contents of everything a package is built from, including this
+    script, which controls the package layout.
+    """
+    digest = hashlib.sha256()
+    for path in inputs + [Path(__file__)]:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.file_digest(f, 'sha256').digest())
+    return digest.hexdigest()
+
+def digest_path(zip_path):
+    """Sidecar file recording the input digest a zip was built from"""
+    return zip_path.with_name(zip_path.name + '.sha256')
+
+def is_up_to_date(zip_path, digest):
+    """Check whether an existing zip was built from exactly these inputs"""
+    recorded = digest_path(zip_path)
+    return zip_path.exists() and recorded.exists() and recorded.read_text() == digest
+
 def build_lambda_package(lambda_dir, output_dir):
     """Create a zip file for a Lambda function"""
     function_name = lambda_dir.name
@@ -15,7 +125,7 @@ def build_lambda_package(lambda_dir, output_dir):
     requirements_txt = lambda_dir / "requirements.txt"
 
     if not index_py.exists():
-        print(f"⚠️  Skipping {function_name} - no index.py found")
+        log(f"⚠️  Skipping {function_name} - no index.py found")
         return
 
     zip_path = output_dir / f"{function_name}.zip"
@@ -23,67 +133,107 @@ def build_lambda_package(lambda_dir, output_dir):
     # Check if this Lambda has dependencies
     has_requirements = requirements_txt.exists()
 
+    digest = input_digest([index_py] + ([requirements_txt] if has_requirements else []))
+    if is_up_to_date(zip_path, digest):
+        log(f"✓ {function_name}.zip up to date")
+        return zip_path
+
+    # Drop the old digest first so an interrupted build is never seen as current
+    digest_path(zip_path).unlink(missing_ok=True)
+
     if has_requirements:
-        # Build with dependencies using a temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Install dependencies to temp directory
-            # Use pre-built wheels compatible with AWS Lambda (Amazon Linux 2)
-            print(f"  Installing dependencies for {function_name}...")
-            subprocess.run(
-                [
-                    "pip", "install",
-                    "-r", str(requirements_txt),
-                    "-t", str(temp_path),
-                    "--platform", "manylinux2014_x86_64",
-                    "--only-binary=:all:",
-                    "--python-version", "3.12",
-                    "--implementation", "cp",
-                    "--quiet"
-                ],
-                check=True
-            )
-
-            # Create zip with dependencies and code
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all dependency files
-                for root, dirs, files in os.walk(temp_path):
-                    for file in files:
-                        file_path = Path(root) / file
-                        arcname = file_path.relative_to(temp_path)
-                        zipf.write(file_path, arcname)
-
-                # Add the Lambda handler
-                zipf.write(index_py, 'index.py')
+        deps_dir = install_dependencies(requirements_txt, function_name)
+
+        # Create zip with dependencies and code
+        # Dependency trees (Pillow) are large, so keep DEFLATE for package
+        # size but use the fastest level - the ratio gain above 1 is small.
+        # At this level zlib is not the bottleneck (pip is), so the builder
+        # stays stdlib-only rather than pulling in a libdeflate binding
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            # Add all dependency files
+            for file_path, arcname in iter_package_files(deps_dir):
+                add_file(zipf, file_path, arcname)
+
+            # Add the Lambda handler
+            add_file(zipf, index_py, 'index.py')
     else:
-        # Simple Lambda with no dependencies
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(index_py, 'index.py')
+        # Simple Lambda with no dependencies - a single small file gains
+        # nothing from compression, so store it as-is
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+            add_file(zipf, index_py, 'index.py')
+
+    digest_path(zip_path).write_text(digest)
 
     size_kb = zip_path.stat().st_size / 1024
     deps_note = " (with dependencies)" if has_requirements else ""
-    print(f"✓ Built {function_name}.zip ({size_kb:.1f} KB){deps_note}")
+    log(f"✓ Built {function_name}.zip ({size_kb:.1f} KB){deps_note}")
+
+    return zip_path
+
+def build_layer_package(layer_dir, output_dir):
+    """
+    Create a zip file for a Lambda layer from its requirements.txt.
+
+    Files go under python/, which Lambda adds to sys.path from /opt/python.
+    """
+    layer_name = layer_dir.name
+    requirements_txt = layer_dir / "requirements.txt"
+
+    if not requirements_txt.exists():
+        log(f"⚠️  Skipping {layer_name} layer - no requirements.txt found")
+        return
+
+    zip_path = output_dir / f"{layer_name}_layer.zip"
+
+    digest = input_digest([requirements_txt])
+    if is_up_to_date(zip_path, digest):
+        log(f"✓ {layer_name}_layer.zip up to date")
+        return zip_path
+
+    digest_path(zip_path).unlink(missing_ok=True)
+
+    deps_dir = install_dependencies(requirements_txt, f"{layer_name} layer")
+
+    # Same compression trade-off as function packages with dependencies
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        for file_path, arcname in iter_package_files(deps_dir, 'python/'):
+            add_file(zipf, file_path, arcname)
+
+    digest_path(zip_path).write_text(digest)
+
+    size_kb = zip_path.stat().st_size / 1024
+    log(f"✓ Built {layer_name}_layer.zip ({size_kb:.1f} KB)")
 
     return zip_path
 
+def package_dirs(base_dir):
+    """List package source directories (one per function or layer)"""
+    if not base_dir.is_dir():
+        return []
+    return [
+        package_dir for package_dir in sorted(base_dir.iterdir())
+        if package_dir.is_dir() and not package_dir.name.startswith('.')
+    ]
+
 def main():
     script_dir = Path(__file__).parent
-    lambda_base_dir = script_dir / "lambda"
+    lambda_dirs = package_dirs(script_dir / "lambda")
+    layer_dirs = package_dirs(script_dir / "layers")
 
     print("Building Lambda deployment packages...")
     print()
 
-    built_packages = []
-
-    for lambda_dir in sorted(lambda_base_dir.iterdir()):
-        if lambda_dir.is_dir() and not lambda_dir.name.startswith('.'):
-            zip_path = build_lambda_package(lambda_dir, lambda_base_dir.parent)
-            if zip_path:
-                built_packages.append(zip_path)
+    # Packages are independent (dependencies come from per-requirements cache
+    # entries), so build them concurrently - pip and zip work is I/O bound
+    max_workers = min(os.cpu_count() or 1, len(lambda_dirs) + len(layer_dirs)) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        function_results = [executor.submit(build_lambda_package, d, script_dir) for d in lambda_dirs]
+        layer_results = [executor.submit(build_layer_package, d, script_dir) for d in layer_dirs]
+        built_packages = [f.result() for f in function_results if f.result()]
+        built_layers = [f.result() for f in layer_results if f.result()]
 
     print()
-    print(f"All {len(built_packages)} Lambda functions built successfully!")
+    print(f"All {len(built_packages)} Lambda functions and {len(built_layers)} layer(s) built successfully!")
 
 if __name__ == "__main__":
     main()
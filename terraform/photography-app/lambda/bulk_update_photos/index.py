@@ -1,29 +1,61 @@
 import boto3
+from botocore.config import Config
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-dynamodb = boto3.resource('dynamodb')
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
+
+# Concurrent update_item calls; matches botocore's default connection pool size
+MAX_CONCURRENT_UPDATES = 10
+
+ALLOWED_ORIGINS = frozenset({
+    'https://www.cindyashleyphotography.com',
+    'https://cindyashleyphotography.com',
+    'http://localhost:5173',
+    'http://localhost:3000',
+})
+
+# Used when the request origin isn't in ALLOWED_ORIGINS
+DEFAULT_ORIGIN = 'https://www.cindyashleyphotography.com'
+
+# Photo attributes that may be changed in bulk
+ALLOWED_FIELDS = frozenset({'gallery', 'status', 'title', 'description', 'alt', 'copyright'})
+
+# 100 photo IDs plus updates fit comfortably; anything larger is rejected unparsed
+MAX_BODY_SIZE = 50_000
+
+# Headers shared by every response; Access-Control-Allow-Origin is added per origin below
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+# Complete response headers for each allowed origin, built once per container
+CORS_HEADERS = {
+    origin: {**RESPONSE_HEADERS, 'Access-Control-Allow-Origin': origin}
+    for origin in ALLOWED_ORIGINS
+}
 
 def is_authenticated(event):
     """Check if request has valid authentication header"""
-    headers = event.get('headers', {})
-    auth_header = headers.get('Authorization') or headers.get('authorization')
-    return auth_header is not None and auth_header.startswith('Bearer ')
+    headers = event.get('headers') or {}
+    auth_header = headers.get('Authorization') or headers.get('authorization') or ''
+    return auth_header.startswith('Bearer ')
 
 def get_allowed_origin(event):
     """CORS allowlist"""
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     origin = headers.get('Origin') or headers.get('origin', '')
 
-    allowed_origins = [
-        'https://www.cindyashleyphotography.com',
-        'https://cindyashleyphotography.com',
-        'http://localhost:5173',
-        'http://localhost:3000',
-    ]
-
-    return origin if origin in allowed_origins else 'https://www.cindyashleyphotography.com'
+    return origin if origin in ALLOWED_ORIGINS else DEFAULT_ORIGIN
 
 def lambda_handler(event, context):
     """
@@ -43,15 +75,19 @@ def lambda_handler(event, context):
     - status change (published, archived)
     - metadata updates (title, description, alt, copyright)
     """
+    allowed_origin = get_allowed_origin(event)
+
     try:
-        # Require authentication
+        # Require authentication before doing any work on the body
         if not is_authenticated(event):
-            return error_response(401, 'Authentication required', 'UnauthorizedError', get_allowed_origin(event))
+            return error_response(401, 'Authentication required', 'UnauthorizedError', allowed_origin)
 
-        allowed_origin = get_allowed_origin(event)
+        body_str = event.get('body') or ''
+        if len(body_str) > MAX_BODY_SIZE:
+            return error_response(413, 'Request body too large', 'ValidationError', allowed_origin)
 
         # Parse request
-        body = json.loads(event['body'])
+        body = json.loads(body_str)
         photo_ids = body.get('photoIds', [])
         updates = body.get('updates', {})
 
@@ -71,10 +107,8 @@ def lambda_handler(event, context):
         expression_attribute_names = {}
         expression_attribute_values = {}
 
-        allowed_fields = ['gallery', 'status', 'title', 'description', 'alt', 'copyright']
-
         for key, value in updates.items():
-            if key not in allowed_fields:
+            if key not in ALLOWED_FIELDS:
                 continue
 
             update_expression_parts.append(f"#{key} = :{key}")
@@ -82,31 +116,41 @@ def lambda_handler(event, context):
             expression_attribute_values[f":{key}"] = value
 
         # Add updatedAt timestamp
+        now = datetime.utcnow().isoformat() + 'Z'
         update_expression_parts.append("#updatedAt = :updatedAt")
         expression_attribute_names["#updatedAt"] = "updatedAt"
-        expression_attribute_values[":updatedAt"] = datetime.utcnow().isoformat() + 'Z'
+        expression_attribute_values[":updatedAt"] = now
 
         # Handle publishedAt for status changes to published
         if 'status' in updates and updates['status'] == 'published':
             update_expression_parts.append("#publishedAt = if_not_exists(#publishedAt, :publishedAt)")
             expression_attribute_names["#publishedAt"] = "publishedAt"
-            expression_attribute_values[":publishedAt"] = datetime.utcnow().isoformat() + 'Z'
+            expression_attribute_values[":publishedAt"] = now
 
         update_expression = "SET " + ", ".join(update_expression_parts)
 
         # Update each photo
-        table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
         succeeded = []
         failed = []
 
-        for photo_id in photo_ids:
+        # Worker threads share the resource's low-level client, which (unlike
+        # the Table resource) is thread-safe; it still serializes plain values
+        def update_photo(photo_id):
+            table.meta.client.update_item(
+                TableName=table.name,
+                Key={'photoId': photo_id},
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=expression_attribute_names,
+                ExpressionAttributeValues=expression_attribute_values
+            )
+
+        # Each update is an independent round-trip, so overlap them
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPDATES) as executor:
+            futures = [(photo_id, executor.submit(update_photo, photo_id)) for photo_id in photo_ids]
+
+        for photo_id, future in futures:
             try:
-                table.update_item(
-                    Key={'photoId': photo_id},
-                    UpdateExpression=update_expression,
-                    ExpressionAttributeNames=expression_attribute_names,
-                    ExpressionAttributeValues=expression_attribute_values
-                )
+                future.result()
                 succeeded.append(photo_id)
             except Exception as e:
                 print(f"Failed to update {photo_id}: {str(e)}")
@@ -128,29 +172,17 @@ def success_response(data, allowed_origin, status_code=200):
     """Standard success response with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
-        'body': json.dumps(data)
+        'headers': CORS_HEADERS[allowed_origin],
+        'body': json.dumps(data, separators=(',', ':'))
     }
 
-def error_response(status_code, message, error_type='Error', allowed_origin='https://www.cindyashleyphotography.com'):
+def error_response(status_code, message, error_type='Error', allowed_origin=DEFAULT_ORIGIN):
     """Standard error response with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
+        'headers': CORS_HEADERS[allowed_origin],
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
@@ -1,24 +1,56 @@
 import boto3
+from botocore.config import Config
 import json
 import os
+import re
 from datetime import datetime
 
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
 # boto3 automatically uses the Lambda function's region
-ses = boto3.client('ses')
+ses = boto3.client('ses', config=BOTO_CONFIG)
+
+# Email configuration, read once per container
+RECIPIENT_EMAILS = [email for email in os.environ.get('RECIPIENT_EMAILS', '').split(',') if email]
+SENDER_EMAIL = os.environ.get('SENDER_EMAIL')
+
+ALLOWED_ORIGINS = frozenset({
+    'https://www.cindyashleyphotography.com',
+    'https://cindyashleyphotography.com',
+    'http://localhost:5173',
+    'http://localhost:3000',
+})
+
+# Used when the request origin isn't in ALLOWED_ORIGINS
+DEFAULT_ORIGIN = 'https://www.cindyashleyphotography.com'
+
+# A contact message is a few KB at most; anything larger is rejected unparsed
+MAX_BODY_SIZE = 16_384
+
+# One address, no whitespace, with a dot somewhere in the domain
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Headers shared by every response; Access-Control-Allow-Origin is added per origin below
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+# Complete response headers for each allowed origin, built once per container
+CORS_HEADERS = {
+    origin: {**RESPONSE_HEADERS, 'Access-Control-Allow-Origin': origin}
+    for origin in ALLOWED_ORIGINS
+}
 
 def get_allowed_origin(event):
     """CORS allowlist"""
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     origin = headers.get('Origin') or headers.get('origin', '')
 
-    allowed_origins = [
-        'https://www.cindyashleyphotography.com',
-        'https://cindyashleyphotography.com',
-        'http://localhost:5173',
-        'http://localhost:3000',
-    ]
-
-    return origin if origin in allowed_origins else 'https://www.cindyashleyphotography.com'
+    return origin if origin in ALLOWED_ORIGINS else DEFAULT_ORIGIN
 
 def lambda_handler(event, context):
     """
@@ -35,8 +67,12 @@ def lambda_handler(event, context):
     try:
         allowed_origin = get_allowed_origin(event)
 
+        body_str = event.get('body') or ''
+        if len(body_str) > MAX_BODY_SIZE:
+            return error_response(413, 'Request body too large', 'ValidationError', allowed_origin)
+
         # Parse request body
-        body = json.loads(event['body'])
+        body = json.loads(body_str)
         name = body.get('name', '').strip()
         sender_email = body.get('email', '').strip()
         subject = body.get('subject', '').strip()
@@ -47,14 +83,10 @@ def lambda_handler(event, context):
             return error_response(400, 'Missing required fields', 'ValidationError', allowed_origin)
 
         # Basic email validation
-        if '@' not in sender_email or '.' not in sender_email:
+        if not EMAIL_PATTERN.match(sender_email):
             return error_response(400, 'Invalid email address', 'ValidationError', allowed_origin)
 
-        # Get email configuration from environment
-        recipient_emails = os.environ.get('RECIPIENT_EMAILS', '').split(',')
-        sender = os.environ.get('SENDER_EMAIL')
-
-        if not recipient_emails or not sender:
+        if not RECIPIENT_EMAILS or not SENDER_EMAIL:
             print("ERROR: Missing email configuration in environment variables")
             return error_response(500, 'Email service not configured', 'ConfigurationError', allowed_origin)
 
@@ -76,8 +108,8 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
 
         # Send email via SES
         response = ses.send_email(
-            Source=sender,
-            Destination={'ToAddresses': recipient_emails},
+            Source=SENDER_EMAIL,
+            Destination={'ToAddresses': RECIPIENT_EMAILS},
             Message={
                 'Subject': {'Data': email_subject, 'Charset': 'UTF-8'},
                 'Body': {'Text': {'Data': email_body, 'Charset': 'UTF-8'}}
@@ -105,29 +137,17 @@ def success_response(data, allowed_origin, status_code=200):
     """Standard success response with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
-        'body': json.dumps(data)
+        'headers': CORS_HEADERS[allowed_origin],
+        'body': json.dumps(data, separators=(',', ':'))
     }
 
-def error_response(status_code, message, error_type='Error', allowed_origin='https://www.cindyashleyphotography.com'):
+def error_response(status_code, message, error_type='Error', allowed_origin=DEFAULT_ORIGIN):
     """Standard error response with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
+        'headers': CORS_HEADERS[allowed_origin],
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
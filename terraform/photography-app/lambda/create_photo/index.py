@@ -1,18 +1,38 @@
 import boto3
+from botocore.config import Config
 import json
 import os
 import re
 from datetime import datetime
-from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
+s3_client = boto3.client('s3', config=BOTO_CONFIG)
+BUCKET_NAME = os.environ['PHOTOS_BUCKET_NAME']
 
 UUID_PATTERN = re.compile(
     r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
     re.IGNORECASE
 )
 
+# Upload extensions (as written by generate_upload_url) and their MIME types
+UPLOAD_MIME_TYPES = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'webp': 'image/webp',
+}
+
+# Headers are identical for every response
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+}
+
 def lambda_handler(event, context):
     """
     Create photo metadata in DynamoDB after S3 upload.
@@ -62,34 +82,41 @@ def lambda_handler(event, context):
                       if not body.get(f)]
             return error_response(400, f'Missing required fields: {", ".join(missing)}', 'ValidationError')
 
+        # Validate field types (the item is stored as sent)
+        invalid = [f for f, v in [('photoId', photo_id), ('title', title), ('alt', alt),
+                                  ('description', description), ('gallery', gallery)]
+                   if not isinstance(v, str)]
+        if invalid:
+            return error_response(400, f'Fields must be strings: {", ".join(invalid)}', 'ValidationError')
+
         # Validate UUID format
         if not UUID_PATTERN.match(photo_id):
             return error_response(400, 'Invalid photoId format (must be UUID v4)', 'ValidationError')
 
         # Find the uploaded file in S3
-        bucket = os.environ['PHOTOS_BUCKET_NAME']
         original_key = None
         file_size = None
         mime_type = None
 
-        # Try common extensions
-        for ext in ['jpg', 'jpeg', 'png', 'webp']:
-            key = f"uploads/{photo_id}.{ext}"
-            try:
-                response = s3_client.head_object(Bucket=bucket, Key=key)
-                original_key = key
-                file_size = response['ContentLength']
-                mime_type = response.get('ContentType', 'image/jpeg')
+        # One listing finds the upload whatever its extension
+        response = s3_client.list_objects_v2(
+            Bucket=BUCKET_NAME,
+            Prefix=f"uploads/{photo_id}.",
+            MaxKeys=5
+        )
+
+        for obj in response.get('Contents', []):
+            ext = obj['Key'].rsplit('.', 1)[-1].lower()
+            if ext in UPLOAD_MIME_TYPES:
+                original_key = obj['Key']
+                file_size = obj['Size']
+                mime_type = UPLOAD_MIME_TYPES[ext]
                 break
-            except s3_client.exceptions.ClientError:
-                continue
 
         if not original_key:
             return error_response(404, 'Uploaded file not found in S3', 'NotFoundError')
 
         # Create DynamoDB item
-        table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
-
         now = datetime.utcnow().isoformat() + 'Z'
 
         item = {
@@ -109,9 +136,6 @@ def lambda_handler(event, context):
             'updatedAt': now
         }
 
-        # Convert numbers to Decimal for DynamoDB
-        item = json.loads(json.dumps(item), parse_float=Decimal, parse_int=Decimal)
-
         table.put_item(Item=item)
 
         return success_response({
@@ -130,25 +154,17 @@ def success_response(data, status_code=200):
     """Standard success response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
-        'body': json.dumps(data)
+        'headers': RESPONSE_HEADERS,
+        'body': json.dumps(data, separators=(',', ':'))
     }
 
 def error_response(status_code, message, error_type='Error'):
     """Standard error response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
+        'headers': RESPONSE_HEADERS,
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
@@ -1,18 +1,30 @@
 import boto3
+from botocore.config import Config
 import json
 import os
 from datetime import datetime
 from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
 
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to int/float"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
+s3_client = boto3.client('s3', config=BOTO_CONFIG)
+BUCKET_NAME = os.environ['PHOTOS_BUCKET_NAME']
+
+# Headers are identical for every response
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+}
+
+def decimal_default(obj):
+    """json.dumps hook to convert DynamoDB Decimal to int/float"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def lambda_handler(event, context):
     """
@@ -42,9 +54,12 @@ def lambda_handler(event, context):
         # Parse path parameter
         photo_id = event['pathParameters']['photoId']
 
-        # Get current item
-        table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
-        response = table.get_item(Key={'photoId': photo_id})
+        # Get current item (only the attributes needed to delete it)
+        response = table.get_item(
+            Key={'photoId': photo_id},
+            ProjectionExpression='originalKey, #status',
+            ExpressionAttributeNames={'#status': 'status'}
+        )
 
         if 'Item' not in response:
             return error_response(404, 'Photo not found', 'NotFoundError')
@@ -52,32 +67,33 @@ def lambda_handler(event, context):
         current_item = response['Item']
         current_status = current_item.get('status', '')
         source_key = current_item['originalKey']
-        bucket = os.environ['PHOTOS_BUCKET_NAME']
         now = datetime.utcnow().isoformat() + 'Z'
 
         # Extract filename for thumbnail/display deletion
         # For uploads/originals: uploads/file.jpg -> file.jpg
         # For archive: archive/uuid.jpg -> uuid.jpg (but we need original filename)
         # We'll use the basename for simplicity
-        filename = os.path.basename(source_key)
+        filename = source_key.rpartition('/')[2]
         thumbnail_key = f"thumbnails/{filename}"
         display_key = f"display/{filename}"
 
         # If already archived, permanently delete
         if current_status == 'archived':
-            # Delete original/archive from S3
-            s3_client.delete_object(Bucket=bucket, Key=source_key)
-
-            # Delete thumbnail and display versions (may not exist, ignore errors)
-            try:
-                s3_client.delete_object(Bucket=bucket, Key=thumbnail_key)
-            except Exception as e:
-                print(f"Warning: Could not delete thumbnail {thumbnail_key}: {str(e)}")
+            # Delete original/archive, thumbnail and display in one request
+            # (missing thumbnail/display versions are not an error)
+            delete_response = s3_client.delete_objects(
+                Bucket=BUCKET_NAME,
+                Delete={
+                    'Objects': [{'Key': source_key}, {'Key': thumbnail_key}, {'Key': display_key}],
+                    'Quiet': True
+                }
+            )
 
-            try:
-                s3_client.delete_object(Bucket=bucket, Key=display_key)
-            except Exception as e:
-                print(f"Warning: Could not delete display {display_key}: {str(e)}")
+            for error in delete_response.get('Errors', []):
+                print(f"Warning: Could not delete {error['Key']}: {error.get('Message')}")
+                # Keep the DynamoDB record if the original itself is still there
+                if error['Key'] == source_key:
+                    raise Exception(f"Failed to delete original {source_key}")
 
             # Delete from DynamoDB
             table.delete_item(Key={'photoId': photo_id})
@@ -89,37 +105,29 @@ def lambda_handler(event, context):
             })
 
         # Otherwise, soft delete (move to archive/)
-        ext = source_key.split('.')[-1]
+        ext = source_key.rpartition('.')[2]
         dest_key = f"archive/{photo_id}.{ext}"
 
         # Copy original to archive
         print(f"Copying {source_key} to {dest_key}")
         try:
             s3_client.copy_object(
-                Bucket=bucket,
-                CopySource={'Bucket': bucket, 'Key': source_key},
+                Bucket=BUCKET_NAME,
+                CopySource={'Bucket': BUCKET_NAME, 'Key': source_key},
                 Key=dest_key
             )
             print(f"Successfully copied to {dest_key}")
         except Exception as e:
             print(f"Error copying file: {str(e)}")
-            print(f"Source: {source_key}, Dest: {dest_key}, Bucket: {bucket}")
+            print(f"Source: {source_key}, Dest: {dest_key}, Bucket: {BUCKET_NAME}")
             raise  # Re-raise to trigger 500 error with logging
 
-        # Delete original from uploads/originals
-        try:
-            s3_client.delete_object(Bucket=bucket, Key=source_key)
-            print(f"Deleted original: {source_key}")
-        except Exception as e:
-            print(f"Warning: Could not delete original {source_key}: {str(e)}")
-
         # Keep thumbnail and display versions when archiving
         # This allows archived photos to be used as hero images
         # They will be deleted only during permanent deletion
 
-        # Update status to archived
-        now_decimal = json.loads(json.dumps(now), parse_float=Decimal)
-
+        # Point the record at the archive copy before removing the original,
+        # so a failed update never leaves it referencing a deleted object
         table.update_item(
             Key={'photoId': photo_id},
             UpdateExpression="SET #status = :status, originalKey = :originalKey, archivedAt = :archivedAt, updatedAt = :updatedAt",
@@ -127,11 +135,14 @@ def lambda_handler(event, context):
             ExpressionAttributeValues={
                 ':status': 'archived',
                 ':originalKey': dest_key,
-                ':archivedAt': now_decimal,
-                ':updatedAt': now_decimal
+                ':archivedAt': now,
+                ':updatedAt': now
             }
         )
 
+        # Delete original from uploads/originals
+        delete_original(source_key)
+
         return success_response({
             'photoId': photo_id,
             'status': 'archived',
@@ -146,29 +157,29 @@ def lambda_handler(event, context):
         print(f"Error deleting photo: {str(e)}")
         return error_response(500, 'Internal server error', 'InternalError')
 
+def delete_original(source_key):
+    """Delete an original that has been copied to archive/ (failures are only logged)"""
+    try:
+        s3_client.delete_object(Bucket=BUCKET_NAME, Key=source_key)
+        print(f"Deleted original: {source_key}")
+    except Exception as e:
+        print(f"Warning: Could not delete original {source_key}: {str(e)}")
+
 def success_response(data, status_code=200):
     """Standard success response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
-        'body': json.dumps(data, cls=DecimalEncoder)
+        'headers': RESPONSE_HEADERS,
+        'body': json.dumps(data, default=decimal_default, separators=(',', ':'))
     }
 
 def error_response(status_code, message, error_type='Error'):
     """Standard error response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
+        'headers': RESPONSE_HEADERS,
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
@@ -1,22 +1,40 @@
 import boto3
-import os
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import tempfile
 from urllib.parse import unquote_plus
 from PIL import Image
 from io import BytesIO
 
+# Register the formats we handle during init rather than on first use.
+# Image.open only preloads a few plugins and falls back to importing all
+# of them when none match (e.g. for WebP)
+from PIL import JpegImagePlugin, PngImagePlugin, WebPImagePlugin
+
 # Import AVIF plugin to register AVIF format support
 try:
     import pillow_avif
 except ImportError:
     print("Warning: pillow-avif-plugin not available, AVIF support disabled")
 
-s3_client = boto3.client('s3')
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+s3_client = boto3.client('s3', config=BOTO_CONFIG)
+
+# Images over the threshold (e.g. large display-size PNGs) are uploaded
+# as multipart uploads with parts sent in parallel
+TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, max_concurrency=4)
 
 # Image size configuration
-THUMBNAIL_WIDTH = 400   # Max width for gallery thumbnails
-DISPLAY_WIDTH = 1920    # Max width for hero/full-screen display
-IMAGE_QUALITY = 85      # JPEG quality (1-100)
+THUMBNAIL_WIDTH = 400      # Max width for gallery thumbnails
+DISPLAY_WIDTH = 1920       # Max width for hero/full-screen display
+IMAGE_QUALITY = 85         # JPEG quality (1-100)
+RESIZE_REDUCING_GAP = 3.0  # Pre-reduce with a box filter before LANCZOS
+PNG_COMPRESS_LEVEL = 6     # zlib level for PNG output (0-9)
+
+# Modes flattened onto a white background for JPEG compatibility
+FLATTEN_MODES = ('RGBA', 'LA', 'P')
 
 def lambda_handler(event, context):
     """
@@ -57,46 +75,57 @@ def lambda_handler(event, context):
 
         # Generate keys (preserve filename, change prefix)
         # uploads/abc-123.jpg -> thumbnails/abc-123.jpg, display/abc-123.jpg
-        filename = os.path.basename(source_key)
+        filename = source_key.rpartition('/')[2]
         thumbnail_key = f"thumbnails/{filename}"
         display_key = f"display/{filename}"
 
         # Download original image from S3
         print(f"Downloading original image: {source_key}")
         response = s3_client.get_object(Bucket=bucket_name, Key=source_key)
-        image_data = response['Body'].read()
         content_type = response['ContentType']
 
-        image_size_mb = len(image_data) / (1024 * 1024)
+        image_size_mb = response['ContentLength'] / (1024 * 1024)
         print(f"Image size: {image_size_mb:.2f} MB, Content-Type: {content_type}")
 
-        # Generate thumbnail (400px for galleries)
-        print(f"Generating thumbnail (max width: {THUMBNAIL_WIDTH}px)")
-        thumbnail_data = resize_image(image_data, content_type, THUMBNAIL_WIDTH)
+        print(f"Opening image with Pillow (content_type: {content_type})")
+        # Read the whole body up front: StreamingBody.read() checks the
+        # content length and checksum, and Pillow decodes lazily (after
+        # draft()) from the in-memory copy once the connection is released
+        img = Image.open(BytesIO(response['Body'].read()))
+        print(f"Image opened: {img.format}, size: {img.size}, mode: {img.mode}")
 
-        # Generate display size (1920px for hero/full-screen)
-        print(f"Generating display size (max width: {DISPLAY_WIDTH}px)")
-        display_data = resize_image(image_data, content_type, DISPLAY_WIDTH)
+        # Originals already within a target width are copied server-side
+        # instead of re-encoded, unless they need converting (AVIF, transparency)
+        can_copy_original = content_type != 'image/avif' and img.mode not in FLATTEN_MODES
+        copy_display = can_copy_original and img.width <= DISPLAY_WIDTH
+        copy_thumbnail = can_copy_original and img.width <= THUMBNAIL_WIDTH
 
-        # Upload thumbnail to S3
-        print(f"Uploading thumbnail: {thumbnail_key}")
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=thumbnail_key,
-            Body=thumbnail_data,
-            ContentType=content_type,
-            CacheControl='max-age=31536000',
-        )
+        # Decode the original once; both sizes are derived from it. When the
+        # display size is a copy, the decode only has to cover the thumbnail
+        if not copy_thumbnail:
+            img = prepare_image(img, THUMBNAIL_WIDTH if copy_display else DISPLAY_WIDTH)
 
-        # Upload display size to S3
-        print(f"Uploading display size: {display_key}")
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=display_key,
-            Body=display_data,
-            ContentType=content_type,
-            CacheControl='max-age=31536000',
-        )
+        # Generate display size (1920px for hero/full-screen)
+        if copy_display:
+            print(f"Copying original as display size: {display_key}")
+            copy_original(bucket_name, source_key, display_key, content_type)
+            display_img = img
+        else:
+            print(f"Generating display size (max width: {DISPLAY_WIDTH}px)")
+            display_img = resize_image(img, DISPLAY_WIDTH)
+            print(f"Uploading display size: {display_key}")
+            upload_image(bucket_name, display_key, encode_image(display_img, content_type), content_type)
+
+        # Generate thumbnail (400px for galleries) from the display size,
+        # which is far cheaper to downscale than the full-resolution original
+        if copy_thumbnail:
+            print(f"Copying original as thumbnail: {thumbnail_key}")
+            copy_original(bucket_name, source_key, thumbnail_key, content_type)
+        else:
+            print(f"Generating thumbnail (max width: {THUMBNAIL_WIDTH}px)")
+            thumbnail_img = resize_image(display_img, THUMBNAIL_WIDTH)
+            print(f"Uploading thumbnail: {thumbnail_key}")
+            upload_image(bucket_name, thumbnail_key, encode_image(thumbnail_img, content_type), content_type)
 
         print(f"✓ Images created successfully: {thumbnail_key}, {display_key}")
 
@@ -113,31 +142,55 @@ def lambda_handler(event, context):
             'body': f'Error: {str(e)}'
         }
 
-def resize_image(image_data, content_type, max_width):
+def prepare_image(img, min_width):
+    """
+    Decode an opened image ready for resizing.
+
+    JPEGs are decoded at reduced scale using libjpeg's DCT scaling
+    (1/2, 1/4 or 1/8) as long as the result stays at least min_width wide.
+    Transparency is kept; flatten_image removes it after resizing, when
+    there are far fewer pixels to composite.
+
+    Args:
+        img: Pillow image returned by Image.open (not yet loaded)
+        min_width: Smallest width the decoded image may have
+
+    Returns:
+        Decoded Pillow image
+    """
+    # Only the width is constrained, so request a 1px height
+    img.draft(None, (min_width, 1))
+
+    # Palette images only resize with nearest-neighbour, so expand them
+    if img.mode == 'P':
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    else:
+        img.load()
+
+    return img
+
+def flatten_image(img):
+    """Composite a transparent image onto white (for JPEG compatibility)"""
+    if img.mode not in ('RGBA', 'LA'):
+        return img
+
+    background = Image.new('RGB', img.size, (255, 255, 255))
+    # paste() takes the alpha band straight from an RGBA/LA mask, so no
+    # channel needs extracting (split() would copy every band)
+    background.paste(img, mask=img)
+    return background
+
+def resize_image(img, max_width):
     """
     Resize image to specified max width.
 
     Args:
-        image_data: Binary image data
-        content_type: MIME type of the image
+        img: Decoded Pillow image
         max_width: Maximum width in pixels
 
     Returns:
-        Binary resized image data
+        Resized Pillow image
     """
-    # Open image with Pillow
-    print(f"Opening image with Pillow (content_type: {content_type})")
-    img = Image.open(BytesIO(image_data))
-    print(f"Image opened: {img.format}, size: {img.size}, mode: {img.mode}")
-
-    # Convert RGBA to RGB if necessary (for JPEG compatibility)
-    if img.mode in ('RGBA', 'LA', 'P'):
-        background = Image.new('RGB', img.size, (255, 255, 255))
-        if img.mode == 'P':
-            img = img.convert('RGBA')
-        background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-        img = background
-
     # Calculate new dimensions (maintain aspect ratio)
     original_width, original_height = img.size
 
@@ -151,9 +204,23 @@ def resize_image(image_data, content_type, max_width):
         new_width = max_width
         new_height = int(max_width * aspect_ratio)
 
-    # Resize image with high-quality resampling
-    img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # Resize image with high-quality resampling. reducing_gap first shrinks
+    # by an integer factor with a cheap box filter, leaving LANCZOS a much
+    # smaller image; at 3.0 the output is indistinguishable from plain LANCZOS
+    return img.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
+
+def encode_image(img, content_type):
+    """
+    Encode image in the output format for its content type,
+    flattening any transparency.
+
+    Args:
+        img: Pillow image to encode
+        content_type: MIME type of the original image
 
+    Returns:
+        Binary encoded image data
+    """
     # Determine output format based on content type
     # Note: AVIF files are converted to JPEG for broad compatibility
     if content_type == 'image/png':
@@ -165,13 +232,53 @@ def resize_image(image_data, content_type, max_width):
     else:
         output_format = 'JPEG'
 
+    img = flatten_image(img)
+
     # Save to bytes buffer
     buffer = BytesIO()
-    if output_format == 'JPEG':
-        img_resized.save(buffer, format=output_format, quality=IMAGE_QUALITY, optimize=True)
-    elif output_format == 'WEBP':
-        img_resized.save(buffer, format=output_format, quality=IMAGE_QUALITY)
+    if output_format in ('JPEG', 'WEBP'):
+        # No optimize=True for JPEG: the extra Huffman pass makes encoding
+        # ~2.5x slower for ~10% smaller files, which CloudFront caches for a year
+        img.save(buffer, format=output_format, quality=IMAGE_QUALITY)
     else:
-        img_resized.save(buffer, format=output_format, optimize=True)
+        # optimize=True would mean zlib level 9, which is very slow on large
+        # PNGs for a few percent of size; the zlib default is a better trade
+        img.save(buffer, format=output_format, compress_level=PNG_COMPRESS_LEVEL)
 
     return buffer.getvalue()
+
+def upload_image(bucket_name, key, image_data, content_type):
+    """Upload a generated image version to S3"""
+    # Most versions are well under the threshold; a single PutObject
+    # avoids the transfer manager's threads and futures for them
+    if len(image_data) < TRANSFER_CONFIG.multipart_threshold:
+        s3_client.put_object(
+            Bucket=bucket_name,
+            Key=key,
+            Body=image_data,
+            ContentType=content_type,
+            CacheControl='max-age=31536000',
+        )
+        return
+
+    s3_client.upload_fileobj(
+        BytesIO(image_data),
+        bucket_name,
+        key,
+        ExtraArgs={
+            'ContentType': content_type,
+            'CacheControl': 'max-age=31536000',
+        },
+        Config=TRANSFER_CONFIG,
+    )
+
+def copy_original(bucket_name, source_key, key, content_type):
+    """Copy the original server-side as an image version (no download/re-upload)"""
+    s3_client.copy_object(
+        Bucket=bucket_name,
+        CopySource={'Bucket': bucket_name, 'Key': source_key},
+        Key=key,
+        ContentType=content_type,
+        CacheControl='max-age=31536000',
+        MetadataDirective='REPLACE',
+    )
@@ -0,0 +1,82 @@
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from botocore.response import StreamingBody
+from PIL import Image
+
+import index
+
+EVENT = {'Records': [{'s3': {'bucket': {'name': 'b'}, 'object': {'key': 'uploads/photo.jpg'}}}]}
+
+
+class FakeS3:
+    """Serves one object as a real StreamingBody over a seekable stream and records writes"""
+    def __init__(self, data, content_type):
+        self.data = data
+        self.content_type = content_type
+        self.uploads = {}
+        self.copies = {}
+
+    def get_object(self, Bucket, Key):
+        return {
+            'Body': StreamingBody(io.BytesIO(self.data), len(self.data)),
+            'ContentType': self.content_type,
+            'ContentLength': len(self.data),
+        }
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.uploads[key] = fileobj.read()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.uploads[Key] = Body
+
+    def copy_object(self, **kwargs):
+        self.copies[kwargs['Key']] = kwargs
+
+
+class GenerateThumbnailTest(unittest.TestCase):
+    def run_handler(self, size):
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (10, 20, 30)).save(buffer, 'JPEG')
+        s3 = FakeS3(buffer.getvalue(), 'image/jpeg')
+        with patch.object(index, 's3_client', s3):
+            return index.lambda_handler(EVENT, None), s3
+
+    def test_large_original_is_resized(self):
+        result, s3 = self.run_handler((3000, 2000))
+
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(Image.open(io.BytesIO(s3.uploads['display/photo.jpg'])).size, (1920, 1280))
+        self.assertEqual(Image.open(io.BytesIO(s3.uploads['thumbnails/photo.jpg'])).size, (400, 266))
+
+    def test_small_original_is_copied(self):
+        result, s3 = self.run_handler((300, 200))
+
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(set(s3.copies), {'display/photo.jpg', 'thumbnails/photo.jpg'})
+        self.assertEqual(s3.uploads, {})
+
+    def test_truncated_body_fails(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (3000, 2000)).save(buffer, 'JPEG')
+        data = buffer.getvalue()
+        s3 = FakeS3(data, 'image/jpeg')
+        s3.get_object = lambda Bucket, Key: {
+            'Body': StreamingBody(io.BytesIO(data[:len(data) // 2]), len(data)),
+            'ContentType': 'image/jpeg',
+            'ContentLength': len(data),
+        }
+
+        with patch.object(index, 's3_client', s3):
+            result = index.lambda_handler(EVENT, None)
+
+        self.assertEqual(result['statusCode'], 500)
+        self.assertEqual(s3.uploads, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
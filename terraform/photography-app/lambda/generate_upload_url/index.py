@@ -1,12 +1,32 @@
 import boto3
+from botocore.config import Config
 import uuid
 import json
 import os
 from datetime import datetime, timedelta
 
-s3_client = boto3.client('s3')
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
 
-ALLOWED_MIME_TYPES = ['image/jpeg', 'image/png', 'image/webp']
+s3_client = boto3.client('s3', config=BOTO_CONFIG)
+
+# Upload target and URL lifetime, read once per container
+BUCKET_NAME = os.environ['PHOTOS_BUCKET_NAME']
+EXPIRES_IN = int(os.environ.get('UPLOAD_EXPIRATION', '300'))  # 5 minutes default
+
+# Allowed upload MIME types and the file extension stored for each
+FILE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/webp': 'webp',
+}
+
+# Headers are identical for every response
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',  # CORS handled by API Gateway
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+}
 
 def lambda_handler(event, context):
     """
@@ -35,7 +55,7 @@ def lambda_handler(event, context):
         file_name = body.get('fileName', 'upload')
 
         # Validate file type
-        if not file_type or file_type not in ALLOWED_MIME_TYPES:
+        if not isinstance(file_type, str) or file_type not in FILE_EXTENSIONS:
             return error_response(400, 'Invalid file type. Allowed: JPEG, PNG, WebP', 'ValidationError')
 
         # Validate file size is provided
@@ -45,35 +65,22 @@ def lambda_handler(event, context):
         # Generate UUID for photo
         photo_id = str(uuid.uuid4())
 
-        # Determine file extension
-        ext_map = {
-            'image/jpeg': 'jpg',
-            'image/png': 'png',
-            'image/webp': 'webp'
-        }
-        ext = ext_map.get(file_type, 'jpg')
-
         # S3 key for upload
-        s3_key = f"uploads/{photo_id}.{ext}"
-
-        # Get bucket name from environment
-        bucket_name = os.environ['PHOTOS_BUCKET_NAME']
+        s3_key = f"uploads/{photo_id}.{FILE_EXTENSIONS[file_type]}"
 
         # Generate pre-signed URL
-        expires_in = int(os.environ.get('UPLOAD_EXPIRATION', '300'))  # 5 minutes default
-
         presigned_url = s3_client.generate_presigned_url(
             'put_object',
             Params={
-                'Bucket': bucket_name,
+                'Bucket': BUCKET_NAME,
                 'Key': s3_key,
                 'ContentType': file_type,
             },
-            ExpiresIn=expires_in
+            ExpiresIn=EXPIRES_IN
         )
 
         # Calculate expiration time
-        expires_at = (datetime.utcnow() + timedelta(seconds=expires_in)).isoformat() + 'Z'
+        expires_at = (datetime.utcnow() + timedelta(seconds=EXPIRES_IN)).isoformat() + 'Z'
 
         return success_response({
             'uploadUrl': presigned_url,
@@ -92,25 +99,17 @@ def success_response(data, status_code=200):
     """Standard success response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',  # CORS handled by API Gateway
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
-        'body': json.dumps(data)
+        'headers': RESPONSE_HEADERS,
+        'body': json.dumps(data, separators=(',', ':'))
     }
 
 def error_response(status_code, message, error_type='Error'):
     """Standard error response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
+        'headers': RESPONSE_HEADERS,
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
@@ -1,44 +1,70 @@
 import boto3
+from botocore.config import Config
 import json
 import os
 from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to int/float"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
+
+# CloudFront domain for image URLs, read once per container
+CLOUDFRONT_DOMAIN = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
+if not CLOUDFRONT_DOMAIN:
+    print("WARNING: CLOUDFRONT_DOMAIN_NAME not set in environment")
+
+ALLOWED_ORIGINS = frozenset({
+    'https://www.cindyashleyphotography.com',
+    'https://cindyashleyphotography.com',
+    'http://localhost:5173',  # For local development
+    'http://localhost:3000',  # Alternative dev port
+})
+
+# Used when the request origin isn't in ALLOWED_ORIGINS
+DEFAULT_ORIGIN = 'https://www.cindyashleyphotography.com'
+
+# Headers shared by every response; Access-Control-Allow-Origin is added per origin below
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+# Complete response headers for each allowed origin, built once per container
+CORS_HEADERS = {
+    origin: {**RESPONSE_HEADERS, 'Access-Control-Allow-Origin': origin}
+    for origin in ALLOWED_ORIGINS
+}
+
+def decimal_default(obj):
+    """json.dumps hook to convert DynamoDB Decimal to int/float"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def is_authenticated(event):
     """Check if request has valid authentication header"""
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     # Check for Authorization header (case-insensitive)
-    auth_header = headers.get('Authorization') or headers.get('authorization')
-    return auth_header is not None and auth_header.startswith('Bearer ')
+    auth_header = headers.get('Authorization') or headers.get('authorization') or ''
+    return auth_header.startswith('Bearer ')
 
 def get_allowed_origin(event):
     """
     Get allowed origin for CORS based on request origin.
     Only allows requests from cindyashleyphotography.com domains.
     """
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     origin = headers.get('Origin') or headers.get('origin', '')
 
-    allowed_origins = [
-        'https://www.cindyashleyphotography.com',
-        'https://cindyashleyphotography.com',
-        'http://localhost:5173',  # For local development
-        'http://localhost:3000',  # Alternative dev port
-    ]
-
-    if origin in allowed_origins:
+    if origin in ALLOWED_ORIGINS:
         return origin
 
     # Default to main domain if origin not recognized
-    return 'https://www.cindyashleyphotography.com'
+    return DEFAULT_ORIGIN
 
 def strip_sensitive_fields(photo, is_auth):
     """Remove sensitive fields from photo object for unauthenticated users"""
@@ -57,8 +83,7 @@ def enrich_photo_with_urls(photo, cloudfront_domain):
     """Add thumbnailUrl and fullResUrl to photo object."""
     if 'originalKey' in photo:
         # Extract filename from original key
-        import os
-        filename = os.path.basename(photo['originalKey'])
+        filename = photo['originalKey'].rpartition('/')[2]
 
         # Thumbnail URL (400px for gallery display)
         thumbnail_key = f"thumbnails/{filename}"
@@ -98,16 +123,10 @@ def lambda_handler(event, context):
         # Get allowed origin for CORS
         allowed_origin = get_allowed_origin(event)
 
-        # Get CloudFront domain from environment
-        cloudfront_domain = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
-        if not cloudfront_domain:
-            print("WARNING: CLOUDFRONT_DOMAIN_NAME not set in environment")
-
         # Parse path parameter
         photo_id = event['pathParameters']['photoId']
 
         # Get item from DynamoDB
-        table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
         response = table.get_item(Key={'photoId': photo_id})
 
         if 'Item' not in response:
@@ -125,8 +144,8 @@ def lambda_handler(event, context):
             )
 
         # Enrich with CloudFront URLs
-        if cloudfront_domain:
-            photo = enrich_photo_with_urls(photo, cloudfront_domain)
+        if CLOUDFRONT_DOMAIN:
+            photo = enrich_photo_with_urls(photo, CLOUDFRONT_DOMAIN)
 
         # Strip sensitive fields for unauthenticated users
         photo = strip_sensitive_fields(photo, is_auth)
@@ -143,29 +162,17 @@ def success_response(data, allowed_origin, status_code=200):
     """Standard success response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
-        'body': json.dumps(data, cls=DecimalEncoder)
+        'headers': CORS_HEADERS[allowed_origin],
+        'body': json.dumps(data, default=decimal_default, separators=(',', ':'))
     }
 
-def error_response(status_code, message, error_type='Error', allowed_origin='https://www.cindyashleyphotography.com'):
+def error_response(status_code, message, error_type='Error', allowed_origin=DEFAULT_ORIGIN):
     """Standard error response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
+        'headers': CORS_HEADERS[allowed_origin],
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
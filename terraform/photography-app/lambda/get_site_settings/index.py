@@ -1,37 +1,62 @@
 import boto3
+from botocore.config import Config
 import json
 import os
 from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to int/float"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+settings_table = dynamodb.Table(os.environ['SITE_SETTINGS_TABLE_NAME'])
+photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
+
+# CloudFront domain for image URLs, read once per container
+CLOUDFRONT_DOMAIN = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
+
+ALLOWED_ORIGINS = frozenset({
+    'https://www.cindyashleyphotography.com',
+    'https://cindyashleyphotography.com',
+    'http://localhost:5173',  # For local development
+    'http://localhost:3000',  # Alternative dev port
+})
+
+# Used when the request origin isn't in ALLOWED_ORIGINS
+DEFAULT_ORIGIN = 'https://www.cindyashleyphotography.com'
+
+# Headers shared by every response; Access-Control-Allow-Origin is added per origin below
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,PATCH,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+# Complete response headers for each allowed origin, built once per container
+CORS_HEADERS = {
+    origin: {**RESPONSE_HEADERS, 'Access-Control-Allow-Origin': origin}
+    for origin in ALLOWED_ORIGINS
+}
+
+def decimal_default(obj):
+    """json.dumps hook to convert DynamoDB Decimal to int/float"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def get_allowed_origin(event):
     """
     Get allowed origin for CORS based on request origin.
     Only allows requests from cindyashleyphotography.com domains.
     """
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     origin = headers.get('Origin') or headers.get('origin', '')
 
-    allowed_origins = [
-        'https://www.cindyashleyphotography.com',
-        'https://cindyashleyphotography.com',
-        'http://localhost:5173',  # For local development
-        'http://localhost:3000',  # Alternative dev port
-    ]
-
-    if origin in allowed_origins:
+    if origin in ALLOWED_ORIGINS:
         return origin
 
     # Default to main domain if origin not recognized
-    return 'https://www.cindyashleyphotography.com'
+    return DEFAULT_ORIGIN
 
 def lambda_handler(event, context):
     """
@@ -55,127 +80,11 @@ def lambda_handler(event, context):
         allowed_origin = get_allowed_origin(event)
         setting_id = event['pathParameters']['settingId']
 
-        # Get settings from DynamoDB
-        settings_table = dynamodb.Table(os.environ['SITE_SETTINGS_TABLE_NAME'])
-        response = settings_table.get_item(Key={'settingId': setting_id})
-
-        if 'Item' not in response:
-            # Return defaults for hero settings
-            if setting_id == 'hero':
-                return success_response({
-                    'settingId': 'hero',
-                    'heroPhotoId': None,
-                    'heroImageUrl': None,
-                    'title': 'Photography Portfolio',
-                    'subtitle': 'Capturing life one frame at a time',
-                    'fitImageToContainer': False
-                }, allowed_origin)
-            # Return defaults for about settings
-            if setting_id == 'about':
-                return success_response({
-                    'settingId': 'about',
-                    'heroPhotoId': None,
-                    'heroImageUrl': None,
-                    'title': 'About Me',
-                    'subtitle': 'Telling stories through the lens',
-                    'fitImageToContainer': False,
-                    'sections': [
-                        {
-                            'heading': 'My Journey',
-                            'body': 'Photography has been my passion for over a decade. What started as a hobby quickly became a way of seeing and experiencing the world.\n\nEvery photograph is an opportunity to freeze time, to capture the fleeting beauty of a moment that will never come again.'
-                        },
-                        {
-                            'heading': 'My Approach',
-                            'body': 'My photography style blends technical precision with artistic intuition. I believe that the best photographs are those that evoke emotion and tell a story.\n\nI work primarily with natural light and believe in minimal post-processing, letting the authentic beauty of each moment shine through.'
-                        }
-                    ]
-                }, allowed_origin)
-            # Return defaults for contact settings
-            if setting_id == 'contact':
-                return success_response({
-                    'settingId': 'contact',
-                    'heroPhotoId': None,
-                    'heroImageUrl': None,
-                    'title': 'Get In Touch',
-                    'subtitle': "Let's create something beautiful together",
-                    'fitImageToContainer': False
-                }, allowed_origin)
-            # Return defaults for general settings
-            if setting_id == 'general':
-                return success_response({
-                    'settingId': 'general',
-                    'theme': 'auto'
-                }, allowed_origin)
+        data = load_setting(setting_id)
+        if data is None:
             return error_response(404, 'Setting not found', 'NotFoundError', allowed_origin)
 
-        item = response['Item']
-        data = item.get('data', {})
-
-        # For hero settings, resolve photoId to CloudFront URL
-        if setting_id == 'hero' and data.get('heroPhotoId'):
-            cloudfront_domain = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
-            photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
-
-            photo_response = photos_table.get_item(
-                Key={'photoId': data['heroPhotoId']}
-            )
-
-            if 'Item' in photo_response:
-                photo = photo_response['Item']
-                original_key = photo.get('originalKey', '')
-                # Use display/* version for hero images (1920px optimized)
-                filename = os.path.basename(original_key)
-                display_key = f"display/{filename}"
-                data['heroImageUrl'] = f"https://{cloudfront_domain}/{display_key}"
-            else:
-                # Photo was deleted, clear the reference
-                data['heroImageUrl'] = None
-
-        # For about settings, resolve photoId to CloudFront URL
-        if setting_id == 'about' and data.get('heroPhotoId'):
-            cloudfront_domain = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
-            photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
-
-            photo_response = photos_table.get_item(
-                Key={'photoId': data['heroPhotoId']}
-            )
-
-            if 'Item' in photo_response:
-                photo = photo_response['Item']
-                original_key = photo.get('originalKey', '')
-                # Use display/* version for hero images (1920px optimized)
-                filename = os.path.basename(original_key)
-                display_key = f"display/{filename}"
-                data['heroImageUrl'] = f"https://{cloudfront_domain}/{display_key}"
-            else:
-                # Photo was deleted, clear the reference
-                data['heroImageUrl'] = None
-
-        # For contact settings, resolve photoId to CloudFront URL
-        if setting_id == 'contact' and data.get('heroPhotoId'):
-            cloudfront_domain = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
-            photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
-
-            photo_response = photos_table.get_item(
-                Key={'photoId': data['heroPhotoId']}
-            )
-
-            if 'Item' in photo_response:
-                photo = photo_response['Item']
-                original_key = photo.get('originalKey', '')
-                # Use display/* version for hero images (1920px optimized)
-                filename = os.path.basename(original_key)
-                display_key = f"display/{filename}"
-                data['heroImageUrl'] = f"https://{cloudfront_domain}/{display_key}"
-            else:
-                # Photo was deleted, clear the reference
-                data['heroImageUrl'] = None
-
-        return success_response({
-            'settingId': setting_id,
-            **data,
-            'updatedAt': item.get('updatedAt')
-        }, allowed_origin)
+        return success_response(data, allowed_origin)
 
     except KeyError as e:
         return error_response(400, f'Missing path parameter: {str(e)}', 'ValidationError', allowed_origin)
@@ -183,33 +92,107 @@ def lambda_handler(event, context):
         print(f"Error getting site settings: {str(e)}")
         return error_response(500, 'Internal server error', 'InternalError', allowed_origin)
 
+def load_setting(setting_id):
+    """
+    Load a setting from DynamoDB, falling back to built-in defaults.
+
+    Args:
+        setting_id: Setting to load
+
+    Returns:
+        Setting response data, or None if the setting does not exist
+    """
+    # Get settings from DynamoDB
+    item = settings_table.get_item(Key={'settingId': setting_id}).get('Item')
+
+    if item is None:
+        # Return defaults for hero settings
+        if setting_id == 'hero':
+            return {
+                'settingId': 'hero',
+                'heroPhotoId': None,
+                'heroImageUrl': None,
+                'title': 'Photography Portfolio',
+                'subtitle': 'Capturing life one frame at a time',
+                'fitImageToContainer': False
+            }
+        # Return defaults for about settings
+        if setting_id == 'about':
+            return {
+                'settingId': 'about',
+                'heroPhotoId': None,
+                'heroImageUrl': None,
+                'title': 'About Me',
+                'subtitle': 'Telling stories through the lens',
+                'fitImageToContainer': False,
+                'sections': [
+                    {
+                        'heading': 'My Journey',
+                        'body': 'Photography has been my passion for over a decade. What started as a hobby quickly became a way of seeing and experiencing the world.\n\nEvery photograph is an opportunity to freeze time, to capture the fleeting beauty of a moment that will never come again.'
+                    },
+                    {
+                        'heading': 'My Approach',
+                        'body': 'My photography style blends technical precision with artistic intuition. I believe that the best photographs are those that evoke emotion and tell a story.\n\nI work primarily with natural light and believe in minimal post-processing, letting the authentic beauty of each moment shine through.'
+                    }
+                ]
+            }
+        # Return defaults for contact settings
+        if setting_id == 'contact':
+            return {
+                'settingId': 'contact',
+                'heroPhotoId': None,
+                'heroImageUrl': None,
+                'title': 'Get In Touch',
+                'subtitle': "Let's create something beautiful together",
+                'fitImageToContainer': False
+            }
+        # Return defaults for general settings
+        if setting_id == 'general':
+            return {
+                'settingId': 'general',
+                'theme': 'auto'
+            }
+        return None
+
+    data = item.get('data', {})
+
+    # For hero/about/contact settings, resolve photoId to CloudFront URL
+    if setting_id in ('hero', 'about', 'contact') and data.get('heroPhotoId'):
+        photo = photos_table.get_item(
+            Key={'photoId': data['heroPhotoId']}
+        ).get('Item')
+
+        if photo:
+            original_key = photo.get('originalKey', '')
+            # Use display/* version for hero images (1920px optimized)
+            filename = original_key.rpartition('/')[2]
+            display_key = f"display/{filename}"
+            data['heroImageUrl'] = f"https://{CLOUDFRONT_DOMAIN}/{display_key}"
+        else:
+            # Photo was deleted, clear the reference
+            data['heroImageUrl'] = None
+
+    return {
+        'settingId': setting_id,
+        **data,
+        'updatedAt': item.get('updatedAt')
+    }
+
 def success_response(data, allowed_origin, status_code=200):
     """Standard success response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,PATCH,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
-        'body': json.dumps(data, cls=DecimalEncoder)
+        'headers': CORS_HEADERS[allowed_origin],
+        'body': json.dumps(data, default=decimal_default, separators=(',', ':'))
     }
 
-def error_response(status_code, message, error_type='Error', allowed_origin='https://www.cindyashleyphotography.com'):
+def error_response(status_code, message, error_type='Error', allowed_origin=DEFAULT_ORIGIN):
     """Standard error response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,PATCH,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
+        'headers': CORS_HEADERS[allowed_origin],
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
@@ -1,44 +1,85 @@
 import boto3
+from botocore.config import Config
+import hashlib
 import json
 import os
 from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to int/float"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
+
+# CloudFront domain for image URLs, read once per container
+CLOUDFRONT_DOMAIN = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
+if not CLOUDFRONT_DOMAIN:
+    print("WARNING: CLOUDFRONT_DOMAIN_NAME not set in environment")
+THUMBNAIL_URL_PREFIX = f"https://{CLOUDFRONT_DOMAIN}/thumbnails/"
+DISPLAY_URL_PREFIX = f"https://{CLOUDFRONT_DOMAIN}/display/"
+
+# Photo statuses that can be listed
+VALID_STATUSES = frozenset({'pending', 'published', 'archived'})
+
+# Largest page a caller can request (the admin views ask for 100)
+MAX_LIMIT = 100
+
+ALLOWED_ORIGINS = frozenset({
+    'https://www.cindyashleyphotography.com',
+    'https://cindyashleyphotography.com',
+    'http://localhost:5173',  # For local development
+    'http://localhost:3000',  # Alternative dev port
+})
+
+# Used when the request origin isn't in ALLOWED_ORIGINS
+DEFAULT_ORIGIN = 'https://www.cindyashleyphotography.com'
+
+# Headers shared by every response; Access-Control-Allow-Origin is added per origin below
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+# Complete response headers for each allowed origin, built once per container
+CORS_HEADERS = {
+    origin: {**RESPONSE_HEADERS, 'Access-Control-Allow-Origin': origin}
+    for origin in ALLOWED_ORIGINS
+}
+
+def decimal_default(obj):
+    """json.dumps hook to convert DynamoDB Decimal to int/float"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def is_authenticated(event):
     """Check if request has valid authentication header"""
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     # Check for Authorization header (case-insensitive)
-    auth_header = headers.get('Authorization') or headers.get('authorization')
-    return auth_header is not None and auth_header.startswith('Bearer ')
+    auth_header = headers.get('Authorization') or headers.get('authorization') or ''
+    return auth_header.startswith('Bearer ')
 
 def get_allowed_origin(event):
     """
     Get allowed origin for CORS based on request origin.
     Only allows requests from cindyashleyphotography.com domains.
     """
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     origin = headers.get('Origin') or headers.get('origin', '')
 
-    allowed_origins = [
-        'https://www.cindyashleyphotography.com',
-        'https://cindyashleyphotography.com',
-        'http://localhost:5173',  # For local development
-        'http://localhost:3000',  # Alternative dev port
-    ]
-
-    if origin in allowed_origins:
+    if origin in ALLOWED_ORIGINS:
         return origin
 
     # Default to main domain if origin not recognized
-    return 'https://www.cindyashleyphotography.com'
+    return DEFAULT_ORIGIN
+
+def get_request_etags(event):
+    """ETags the client already holds, from the If-None-Match header"""
+    headers = event.get('headers') or {}
+    if_none_match = headers.get('If-None-Match') or headers.get('if-none-match') or ''
+    return {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
 
 def strip_sensitive_fields(photo, is_auth):
     """Remove sensitive fields from photo object for unauthenticated users"""
@@ -47,24 +88,7 @@ def strip_sensitive_fields(photo, is_auth):
         photo.pop('uploadedBy', None)
     return photo
 
-def generate_cloudfront_url(original_key, cloudfront_domain):
-    """
-    Generate CloudFront URL from S3 key.
-
-    Args:
-        original_key: S3 object key (e.g., 'uploads/abc.jpg', 'originals/def.jpg')
-        cloudfront_domain: CloudFront distribution domain name
-
-    Returns:
-        HTTPS URL to CloudFront distribution
-    """
-    if not original_key:
-        return None
-
-    # CloudFront URL format: https://{domain}/{key}
-    return f"https://{cloudfront_domain}/{original_key}"
-
-def enrich_photo_with_urls(photo, cloudfront_domain):
+def enrich_photo_with_urls(photo):
     """
     Add thumbnailUrl and fullResUrl to photo object.
 
@@ -74,16 +98,13 @@ def enrich_photo_with_urls(photo, cloudfront_domain):
     """
     if 'originalKey' in photo:
         # Extract filename from original key
-        import os
-        filename = os.path.basename(photo['originalKey'])
+        filename = photo['originalKey'].rpartition('/')[2]
 
         # Thumbnail URL (400px for gallery display)
-        thumbnail_key = f"thumbnails/{filename}"
-        photo['thumbnailUrl'] = generate_cloudfront_url(thumbnail_key, cloudfront_domain)
+        photo['thumbnailUrl'] = THUMBNAIL_URL_PREFIX + filename
 
         # Display URL (1920px for full-screen viewing)
-        display_key = f"display/{filename}"
-        photo['fullResUrl'] = generate_cloudfront_url(display_key, cloudfront_domain)
+        photo['fullResUrl'] = DISPLAY_URL_PREFIX + filename
 
     return photo
 
@@ -93,7 +114,7 @@ def lambda_handler(event, context):
 
     Query Parameters:
     - status: "pending" | "published" | "archived" (default: "published")
-    - limit: Max number of photos to return (default: 50)
+    - limit: Max number of photos to return (default: 50, at most 100)
 
     Security:
     - Unauthenticated users can only view published photos
@@ -113,18 +134,15 @@ def lambda_handler(event, context):
         # Get allowed origin for CORS
         allowed_origin = get_allowed_origin(event)
 
-        # Get CloudFront domain from environment
-        cloudfront_domain = os.environ.get('CLOUDFRONT_DOMAIN_NAME')
-        if not cloudfront_domain:
-            print("WARNING: CLOUDFRONT_DOMAIN_NAME not set in environment")
-
         # Parse query parameters
         params = event.get('queryStringParameters') or {}
         status = params.get('status', 'published')
-        limit = int(params.get('limit', 50))
+        limit = min(int(params.get('limit', 50)), MAX_LIMIT)
+        if limit < 1:
+            return error_response(400, 'Invalid limit parameter', 'ValidationError', allowed_origin)
 
         # Validate status value
-        if status not in ['pending', 'published', 'archived']:
+        if status not in VALID_STATUSES:
             return error_response(400, 'Invalid status. Must be: pending, published, or archived', 'ValidationError', allowed_origin)
 
         # Security: Restrict unauthenticated users to published photos only
@@ -136,9 +154,8 @@ def lambda_handler(event, context):
                 allowed_origin
             )
 
-        # Query DynamoDB using GSI
-        table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
-
+        # Query DynamoDB using GSI. This is a single Query call (no paginator),
+        # so each request reads at most one page of `limit` items
         response = table.query(
             IndexName='status-uploadDate-index',
             KeyConditionExpression='#status = :status',
@@ -150,17 +167,17 @@ def lambda_handler(event, context):
 
         photos = response.get('Items', [])
 
-        # Enrich each photo with CloudFront URLs
-        if cloudfront_domain:
-            photos = [enrich_photo_with_urls(photo, cloudfront_domain) for photo in photos]
-
-        # Strip sensitive fields for unauthenticated users
-        photos = [strip_sensitive_fields(photo, is_auth) for photo in photos]
+        # Enrich each photo with CloudFront URLs and strip sensitive fields
+        # for unauthenticated users in a single pass
+        for photo in photos:
+            if CLOUDFRONT_DOMAIN:
+                enrich_photo_with_urls(photo)
+            strip_sensitive_fields(photo, is_auth)
 
         return success_response({
             'photos': photos,
             'count': len(photos)
-        }, allowed_origin)
+        }, allowed_origin, get_request_etags(event))
 
     except ValueError:
         return error_response(400, 'Invalid limit parameter', 'ValidationError', allowed_origin)
@@ -168,33 +185,34 @@ def lambda_handler(event, context):
         print(f"Error listing photos: {str(e)}")
         return error_response(500, 'Internal server error', 'InternalError', allowed_origin)
 
-def success_response(data, allowed_origin, status_code=200):
-    """Standard success response format with CORS"""
+def success_response(data, allowed_origin, request_etags=frozenset(), status_code=200):
+    """
+    Standard success response format with CORS.
+
+    The ETag is a hash of the body, so it changes with any photo, the page
+    contents or what the caller is allowed to see. A client that already
+    holds the same body gets an empty 304 instead.
+    """
+    body = json.dumps(data, default=decimal_default, separators=(',', ':'))
+    etag = f'"{hashlib.blake2b(body.encode(), digest_size=16).hexdigest()}"'
+    headers = {**CORS_HEADERS[allowed_origin], 'ETag': etag}
+
+    if etag in request_etags:
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
-        'body': json.dumps(data, cls=DecimalEncoder)
+        'headers': headers,
+        'body': body
     }
 
-def error_response(status_code, message, error_type='Error', allowed_origin='https://www.cindyashleyphotography.com'):
+def error_response(status_code, message, error_type='Error', allowed_origin=DEFAULT_ORIGIN):
     """Standard error response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
+        'headers': CORS_HEADERS[allowed_origin],
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
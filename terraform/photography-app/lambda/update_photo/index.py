@@ -1,18 +1,43 @@
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import json
 import os
 from datetime import datetime
 from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
 
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to int/float"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
+BUCKET_NAME = os.environ['PHOTOS_BUCKET_NAME']
+
+# Headers are identical for every response
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+}
+
+# Photo attributes copied from the request body as-is
+METADATA_FIELDS = ('title', 'description', 'alt', 'copyright', 'gallery')
+
+# S3 is only needed for status changes, so most metadata edits never create the client
+s3_client = None
+
+def get_s3_client():
+    """Create the S3 client on first use and reuse it across warm invocations"""
+    global s3_client
+    if s3_client is None:
+        s3_client = boto3.client('s3', config=BOTO_CONFIG)
+    return s3_client
+
+def decimal_default(obj):
+    """json.dumps hook to convert DynamoDB Decimal to int/float"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def lambda_handler(event, context):
     """
@@ -39,115 +64,112 @@ def lambda_handler(event, context):
     }
     """
     try:
-        # Parse path parameter and body
+        # Parse path parameter and body (DynamoDB rejects floats, so parse them as Decimal)
         photo_id = event['pathParameters']['photoId']
-        body = json.loads(event['body'])
+        body = json.loads(event['body'], parse_float=Decimal)
 
-        # Get current item
-        table = dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME'])
-        response = table.get_item(Key={'photoId': photo_id})
-
-        if 'Item' not in response:
-            return error_response(404, 'Photo not found', 'NotFoundError')
-
-        current_item = response['Item']
-        current_status = current_item['status']
-        new_status = body.get('status', current_status)
+        now = datetime.utcnow().isoformat() + 'Z'
 
         # Build update expression
-        update_expr = "SET updatedAt = :updatedAt"
-        expr_values = {':updatedAt': datetime.utcnow().isoformat() + 'Z'}
+        update_parts = ["updatedAt = :updatedAt"]
+        expr_values = {':updatedAt': now}
         expr_names = {}
 
-        if 'title' in body:
-            update_expr += ", title = :title"
-            expr_values[':title'] = body['title']
-
-        if 'description' in body:
-            update_expr += ", description = :description"
-            expr_values[':description'] = body['description']
-
-        if 'alt' in body:
-            update_expr += ", alt = :alt"
-            expr_values[':alt'] = body['alt']
-
-        if 'copyright' in body:
-            update_expr += ", copyright = :copyright"
-            expr_values[':copyright'] = body['copyright']
-
-        if 'gallery' in body:
-            update_expr += ", gallery = :gallery"
-            expr_values[':gallery'] = body['gallery']
+        for field in METADATA_FIELDS:
+            if field in body:
+                update_parts.append(f"{field} = :{field}")
+                expr_values[f":{field}"] = body[field]
+
+        # Only a status change needs the current item (to copy its S3 object);
+        # metadata edits go straight to the conditional update below
+        if 'status' in body:
+            response = table.get_item(
+                Key={'photoId': photo_id},
+                ProjectionExpression='originalKey, #status',
+                ExpressionAttributeNames={'#status': 'status'}
+            )
+
+            if 'Item' not in response:
+                return error_response(404, 'Photo not found', 'NotFoundError')
+
+            current_item = response['Item']
+            current_status = current_item['status']
+            new_status = body['status']
+        else:
+            current_status = new_status = None
 
         # Handle status change: pending -> published
         if new_status != current_status:
             if new_status == 'published':
                 # Copy from uploads/ to originals/
-                bucket = os.environ['PHOTOS_BUCKET_NAME']
                 source_key = current_item['originalKey']
 
                 # Determine destination key
-                ext = source_key.split('.')[-1]
+                ext = source_key.rpartition('.')[2]
                 dest_key = f"originals/{photo_id}.{ext}"
 
                 # Copy object
-                s3_client.copy_object(
-                    Bucket=bucket,
-                    CopySource={'Bucket': bucket, 'Key': source_key},
+                get_s3_client().copy_object(
+                    Bucket=BUCKET_NAME,
+                    CopySource={'Bucket': BUCKET_NAME, 'Key': source_key},
                     Key=dest_key
                 )
 
                 # Update status and keys
-                update_expr += ", #status = :status, originalKey = :originalKey, publishedAt = :publishedAt"
+                update_parts.extend(["#status = :status", "originalKey = :originalKey", "publishedAt = :publishedAt"])
                 expr_names['#status'] = 'status'
                 expr_values[':status'] = 'published'
                 expr_values[':originalKey'] = dest_key
-                expr_values[':publishedAt'] = datetime.utcnow().isoformat() + 'Z'
+                expr_values[':publishedAt'] = now
 
             elif new_status == 'archived':
                 # Handle archiving (similar to delete, but through update)
-                bucket = os.environ['PHOTOS_BUCKET_NAME']
                 source_key = current_item['originalKey']
-                ext = source_key.split('.')[-1]
+                ext = source_key.rpartition('.')[2]
                 dest_key = f"archive/{photo_id}.{ext}"
 
-                s3_client.copy_object(
-                    Bucket=bucket,
-                    CopySource={'Bucket': bucket, 'Key': source_key},
+                get_s3_client().copy_object(
+                    Bucket=BUCKET_NAME,
+                    CopySource={'Bucket': BUCKET_NAME, 'Key': source_key},
                     Key=dest_key
                 )
 
-                update_expr += ", #status = :status, originalKey = :originalKey, archivedAt = :archivedAt"
+                update_parts.extend(["#status = :status", "originalKey = :originalKey", "archivedAt = :archivedAt"])
                 expr_names['#status'] = 'status'
                 expr_values[':status'] = 'archived'
                 expr_values[':originalKey'] = dest_key
-                expr_values[':archivedAt'] = datetime.utcnow().isoformat() + 'Z'
-
-        # Convert numbers to Decimal
-        expr_values = json.loads(json.dumps(expr_values), parse_float=Decimal, parse_int=Decimal)
+                expr_values[':archivedAt'] = now
 
-        # Update DynamoDB
+        # Update DynamoDB (the condition stops an update from creating a photo
+        # that doesn't exist or was deleted meanwhile)
         update_kwargs = {
             'Key': {'photoId': photo_id},
-            'UpdateExpression': update_expr,
-            'ExpressionAttributeValues': expr_values
+            'UpdateExpression': "SET " + ", ".join(update_parts),
+            'ConditionExpression': 'attribute_exists(photoId)',
+            'ExpressionAttributeValues': expr_values,
+            'ReturnValues': 'ALL_NEW'
         }
 
         if expr_names:
             update_kwargs['ExpressionAttributeNames'] = expr_names
 
-        table.update_item(**update_kwargs)
+        response = table.update_item(**update_kwargs)
 
         return success_response({
             'photoId': photo_id,
-            'status': new_status,
-            'updatedAt': expr_values[':updatedAt']
+            'status': response['Attributes'].get('status'),
+            'updatedAt': now
         })
 
     except KeyError as e:
         return error_response(400, f'Missing field: {str(e)}', 'ValidationError')
-    except s3_client.exceptions.NoSuchKey:
-        return error_response(404, 'Source file not found in S3', 'NotFoundError')
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return error_response(404, 'Photo not found', 'NotFoundError')
+        if e.response['Error']['Code'] == 'NoSuchKey':
+            return error_response(404, 'Source file not found in S3', 'NotFoundError')
+        print(f"Error updating photo: {str(e)}")
+        return error_response(500, 'Internal server error', 'InternalError')
     except Exception as e:
         print(f"Error updating photo: {str(e)}")
         return error_response(500, 'Internal server error', 'InternalError')
@@ -156,25 +178,17 @@ def success_response(data, status_code=200):
     """Standard success response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
-        'body': json.dumps(data, cls=DecimalEncoder)
+        'headers': RESPONSE_HEADERS,
+        'body': json.dumps(data, default=decimal_default, separators=(',', ':'))
     }
 
 def error_response(status_code, message, error_type='Error'):
     """Standard error response format"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        },
+        'headers': RESPONSE_HEADERS,
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
@@ -1,44 +1,100 @@
 import boto3
+from botocore.config import Config
 import json
 import os
 from datetime import datetime
 from decimal import Decimal
 
-dynamodb = boto3.resource('dynamodb')
-
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to int/float"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Fast connect timeout, adaptive retries, TCP keepalive probes on pooled connections
+BOTO_CONFIG = Config(tcp_keepalive=True, connect_timeout=2, retries={'mode': 'adaptive', 'max_attempts': 3})
+
+dynamodb = boto3.resource('dynamodb', config=BOTO_CONFIG)
+settings_table = dynamodb.Table(os.environ['SITE_SETTINGS_TABLE_NAME'])
+photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
+
+ALLOWED_ORIGINS = frozenset({
+    'https://www.cindyashleyphotography.com',
+    'https://cindyashleyphotography.com',
+    'http://localhost:5173',  # For local development
+    'http://localhost:3000',  # Alternative dev port
+})
+
+# Used when the request origin isn't in ALLOWED_ORIGINS
+DEFAULT_ORIGIN = 'https://www.cindyashleyphotography.com'
+
+# Headers shared by every response; Access-Control-Allow-Origin is added per origin below
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,PATCH,OPTIONS',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+# Complete response headers for each allowed origin, built once per container
+CORS_HEADERS = {
+    origin: {**RESPONSE_HEADERS, 'Access-Control-Allow-Origin': origin}
+    for origin in ALLOWED_ORIGINS
+}
+
+def decimal_default(obj):
+    """json.dumps hook to convert DynamoDB Decimal to int/float"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def get_allowed_origin(event):
     """
     Get allowed origin for CORS based on request origin.
     Only allows requests from cindyashleyphotography.com domains.
     """
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     origin = headers.get('Origin') or headers.get('origin', '')
 
-    allowed_origins = [
-        'https://www.cindyashleyphotography.com',
-        'https://cindyashleyphotography.com',
-        'http://localhost:5173',  # For local development
-        'http://localhost:3000',  # Alternative dev port
-    ]
-
-    if origin in allowed_origins:
+    if origin in ALLOWED_ORIGINS:
         return origin
 
     # Default to main domain if origin not recognized
-    return 'https://www.cindyashleyphotography.com'
+    return DEFAULT_ORIGIN
 
 def get_user_email(event):
     """Extract user email from Cognito authorizer claims"""
     claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
     return claims.get('email', 'unknown')
 
+def put_settings_if_photo_exists(item, photo_id):
+    """
+    Write a settings item only if the photo it references exists.
+
+    The existence check and the write are a single TransactWriteItems
+    call rather than a get_item followed by a put_item.
+
+    Returns:
+        True if written, False if the photo doesn't exist (nothing written)
+    """
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=[
+            {
+                'ConditionCheck': {
+                    'TableName': photos_table.name,
+                    'Key': {'photoId': photo_id},
+                    'ConditionExpression': 'attribute_exists(photoId)'
+                }
+            },
+            {
+                'Put': {
+                    'TableName': settings_table.name,
+                    'Item': item
+                }
+            }
+        ])
+    except dynamodb.meta.client.exceptions.TransactionCanceledException as e:
+        reasons = e.response.get('CancellationReasons', [])
+        if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+            return False
+        raise
+
+    return True
+
 def lambda_handler(event, context):
     """
     Update site settings. Protected endpoint - requires Cognito authentication.
@@ -69,8 +125,6 @@ def lambda_handler(event, context):
 
         # Validate hero settings
         if setting_id == 'hero':
-            hero_photo_id = body.get('heroPhotoId')
-
             # Validate required fields
             if not body.get('title'):
                 return error_response(400, 'Title is required', 'ValidationError', allowed_origin)
@@ -92,20 +146,8 @@ def lambda_handler(event, context):
                 if not isinstance(body.get('fitImageToContainer'), bool):
                     return error_response(400, 'fitImageToContainer must be a boolean', 'ValidationError', allowed_origin)
 
-            # Validate photo exists (allow any status: pending, published, or archived)
-            if hero_photo_id:
-                photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
-                photo_response = photos_table.get_item(
-                    Key={'photoId': hero_photo_id}
-                )
-
-                if 'Item' not in photo_response:
-                    return error_response(400, 'Photo not found', 'ValidationError', allowed_origin)
-
         # Validate about settings
         if setting_id == 'about':
-            about_photo_id = body.get('heroPhotoId')
-
             # Validate required fields
             if not body.get('title'):
                 return error_response(400, 'Title is required', 'ValidationError', allowed_origin)
@@ -130,20 +172,8 @@ def lambda_handler(event, context):
                 if not isinstance(body.get('fitImageToContainer'), bool):
                     return error_response(400, 'fitImageToContainer must be a boolean', 'ValidationError', allowed_origin)
 
-            # Validate photo exists (allow any status: pending, published, or archived)
-            if about_photo_id:
-                photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
-                photo_response = photos_table.get_item(
-                    Key={'photoId': about_photo_id}
-                )
-
-                if 'Item' not in photo_response:
-                    return error_response(400, 'Photo not found', 'ValidationError', allowed_origin)
-
         # Validate contact settings
         if setting_id == 'contact':
-            contact_photo_id = body.get('heroPhotoId')
-
             # Validate required fields
             if not body.get('title'):
                 return error_response(400, 'Title is required', 'ValidationError', allowed_origin)
@@ -155,16 +185,6 @@ def lambda_handler(event, context):
                 if not isinstance(body.get('fitImageToContainer'), bool):
                     return error_response(400, 'fitImageToContainer must be a boolean', 'ValidationError', allowed_origin)
 
-            # Validate photo exists (allow any status: pending, published, or archived)
-            if contact_photo_id:
-                photos_table = dynamodb.Table(os.environ['PHOTOS_TABLE_NAME'])
-                photo_response = photos_table.get_item(
-                    Key={'photoId': contact_photo_id}
-                )
-
-                if 'Item' not in photo_response:
-                    return error_response(400, 'Photo not found', 'ValidationError', allowed_origin)
-
         # Validate general settings
         if setting_id == 'general':
             theme = body.get('theme')
@@ -174,17 +194,22 @@ def lambda_handler(event, context):
                 return error_response(400, 'Theme must be auto, light, or dark', 'ValidationError', allowed_origin)
 
         # Update settings in DynamoDB
-        settings_table = dynamodb.Table(os.environ['SITE_SETTINGS_TABLE_NAME'])
         now = datetime.utcnow().isoformat() + 'Z'
 
-        settings_table.put_item(
-            Item={
-                'settingId': setting_id,
-                'updatedAt': now,
-                'updatedBy': user_email,
-                'data': body
-            }
-        )
+        item = {
+            'settingId': setting_id,
+            'updatedAt': now,
+            'updatedBy': user_email,
+            'data': body
+        }
+
+        # Validate photo exists (allow any status: pending, published, or archived)
+        photo_id = body.get('heroPhotoId') if setting_id in ('hero', 'about', 'contact') else None
+        if photo_id:
+            if not put_settings_if_photo_exists(item, photo_id):
+                return error_response(400, 'Photo not found', 'ValidationError', allowed_origin)
+        else:
+            settings_table.put_item(Item=item)
 
         return success_response({
             'settingId': setting_id,
@@ -204,29 +229,17 @@ def success_response(data, allowed_origin, status_code=200):
     """Standard success response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,PATCH,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
-        'body': json.dumps(data, cls=DecimalEncoder)
+        'headers': CORS_HEADERS[allowed_origin],
+        'body': json.dumps(data, default=decimal_default, separators=(',', ':'))
     }
 
-def error_response(status_code, message, error_type='Error', allowed_origin='https://www.cindyashleyphotography.com'):
+def error_response(status_code, message, error_type='Error', allowed_origin=DEFAULT_ORIGIN):
     """Standard error response format with CORS"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': allowed_origin,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,PATCH,OPTIONS',
-            'Access-Control-Allow-Credentials': 'true',
-        },
+        'headers': CORS_HEADERS[allowed_origin],
         'body': json.dumps({
             'error': message,
             'errorType': error_type
-        })
+        }, separators=(',', ':'))
     }
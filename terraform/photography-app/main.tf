@@ -819,6 +819,19 @@ resource "aws_iam_policy" "lambda_s3_upload_policy" {
           "s3:PutObject"
         ]
         Resource = "${aws_s3_bucket.photos.arn}/uploads/*"
+      },
+      {
+        # create_photo locates the uploaded file by listing its photoId prefix
+        Effect = "Allow"
+        Action = [
+          "s3:ListBucket"
+        ]
+        Resource = aws_s3_bucket.photos.arn
+        Condition = {
+          StringLike = {
+            "s3:prefix" = "uploads/*"
+          }
+        }
       }
     ]
   })
@@ -910,6 +923,7 @@ resource "aws_iam_policy" "lambda_dynamodb_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:ConditionCheckItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
@@ -1017,6 +1031,10 @@ resource "aws_cloudwatch_log_group" "delete_photo_logs" {
 # Lambda Functions
 # ====================
 
+# All functions run on arm64 (Graviton2) - cheaper per GB-second and faster
+# for the Pillow-based thumbnail Lambda. Packages with dependencies must be
+# built with manylinux2014_aarch64 wheels (see build scripts).
+
 resource "aws_lambda_function" "generate_upload_url" {
   filename      = "${path.module}/generate_upload_url.zip"
   function_name = "photography-project-generate-upload-url"
@@ -1025,6 +1043,7 @@ resource "aws_lambda_function" "generate_upload_url" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/generate_upload_url.zip")
 
@@ -1057,6 +1076,7 @@ resource "aws_lambda_function" "create_photo" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/create_photo.zip")
 
@@ -1090,6 +1110,7 @@ resource "aws_lambda_function" "list_photos" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/list_photos.zip")
 
@@ -1122,6 +1143,7 @@ resource "aws_lambda_function" "get_photo" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/get_photo.zip")
 
@@ -1154,6 +1176,7 @@ resource "aws_lambda_function" "update_photo" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/update_photo.zip")
 
@@ -1187,6 +1210,7 @@ resource "aws_lambda_function" "delete_photo" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/delete_photo.zip")
 
@@ -1221,6 +1245,7 @@ resource "aws_lambda_function" "contact_form" {
   runtime       = "python3.12"
   timeout       = 30
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/contact_form.zip")
 
@@ -1253,6 +1278,7 @@ resource "aws_lambda_function" "bulk_update_photos" {
   runtime       = "python3.12"
   timeout       = 60 # Longer timeout for batch operations
   memory_size   = 256
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/bulk_update_photos.zip")
 
@@ -1279,6 +1305,17 @@ resource "aws_lambda_function" "bulk_update_photos" {
 # Thumbnail Generation Lambda (Phase 7)
 # =============================================
 
+# Pillow (+ AVIF plugin) shipped as a shared layer so the function package
+# only contains index.py
+resource "aws_lambda_layer_version" "pillow" {
+  filename                 = "${path.module}/pillow_layer.zip"
+  layer_name               = "${var.project_name}-pillow"
+  compatible_runtimes      = ["python3.12"]
+  compatible_architectures = ["arm64"]
+
+  source_code_hash = filebase64sha256("${path.module}/pillow_layer.zip")
+}
+
 resource "aws_lambda_function" "generate_thumbnail" {
   filename      = "${path.module}/generate_thumbnail.zip"
   function_name = "${var.project_name}-generate-thumbnail"
@@ -1287,6 +1324,8 @@ resource "aws_lambda_function" "generate_thumbnail" {
   runtime       = "python3.12"
   timeout       = 60   # Image processing can take time
   memory_size   = 2048 # 2GB for processing large images (35MB+ JPEGs)
+  architectures = ["arm64"]
+  layers        = [aws_lambda_layer_version.pillow.arn]
 
   source_code_hash = filebase64sha256("${path.module}/generate_thumbnail.zip")
 
@@ -1331,7 +1370,8 @@ resource "aws_iam_policy" "lambda_s3_thumbnail_policy" {
       {
         Effect = "Allow"
         Action = [
-          "s3:PutObject"
+          "s3:PutObject",
+          "s3:AbortMultipartUpload"
         ]
         Resource = [
           "${aws_s3_bucket.photos.arn}/thumbnails/*",
@@ -1393,6 +1433,10 @@ resource "aws_api_gateway_rest_api" "photos_api" {
   name        = "photography-project-api"
   description = "Photo management API for Photography Portfolio"
 
+  # Gzip responses for clients that send Accept-Encoding; photo listings are
+  # tens of KB of JSON, while small responses aren't worth the CPU
+  minimum_compression_size = "1024"
+
   endpoint_configuration {
     types = ["REGIONAL"]
   }
@@ -1916,7 +1960,8 @@ resource "aws_api_gateway_integration_response" "photo_by_id_options_integration
 resource "aws_api_gateway_deployment" "photos_api_deployment" {
   rest_api_id = aws_api_gateway_rest_api.photos_api.id
 
-  # Trigger redeployment when methods change (including authorization)
+  # Trigger redeployment when methods change (including authorization) or
+  # API-level settings such as compression change
   triggers = {
     redeployment = sha1(jsonencode([
       aws_api_gateway_method.list_photos_get.id,
@@ -1931,6 +1976,7 @@ resource "aws_api_gateway_deployment" "photos_api_deployment" {
       aws_api_gateway_method.bulk_update_post.authorization,
       aws_api_gateway_method.get_setting.authorization,
       aws_api_gateway_method.update_setting.authorization,
+      aws_api_gateway_rest_api.photos_api.minimum_compression_size,
     ]))
   }
 
@@ -2059,6 +2105,7 @@ resource "aws_lambda_function" "get_site_settings" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/get_site_settings.zip")
 
@@ -2087,6 +2134,7 @@ resource "aws_lambda_function" "update_site_settings" {
   runtime       = "python3.12"
   timeout       = 10
   memory_size   = 128
+  architectures = ["arm64"]
 
   source_code_hash = filebase64sha256("${path.module}/update_site_settings.zip")
 